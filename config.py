@@ -1,11 +1,35 @@
 """
-Configuration for AI Agent integration
+Configuration for AI Agent integration and database settings
 """
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Database settings, parsed from the environment once at import"""
+    mongodb_url: str
+    database_name: str
+    free_plan_resume_limit: int = 100
+    max_file_size_mb: int = 5
+    mongo_write_concurrency: int = 32
+
+    def __post_init__(self):
+        if not self.mongodb_url.startswith(("mongodb://", "mongodb+srv://")):
+            raise ValueError(f"MONGODB_URL must start with mongodb:// or mongodb+srv://, got {self.mongodb_url!r}")
+
+
+settings = Settings(
+    mongodb_url=os.getenv("MONGODB_URL", "mongodb://localhost:27017"),
+    database_name=os.getenv("DATABASE_NAME", "pod_1"),
+    free_plan_resume_limit=int(os.getenv("FREE_PLAN_RESUME_LIMIT", "100")),
+    max_file_size_mb=int(os.getenv("MAX_FILE_SIZE_MB", "5")),
+    mongo_write_concurrency=int(os.getenv("MONGO_WRITE_CONCURRENCY", "32")),
+)
+
 # AI Agent Configuration
 AI_AGENT_URL = os.getenv("AI_AGENT_URL", "http://localhost:9000")
 AI_AGENT_TIMEOUT = int(os.getenv("AI_AGENT_TIMEOUT", "7200"))  # Increased to 60 minutes for up to 100 resumes
@@ -1,49 +1,122 @@
 # database.py - MongoDB Connection (with GridFS for file storage)
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel, UpdateOne, ASCENDING, DESCENDING, TEXT
 from motor.motor_asyncio import AsyncIOMotorClient
-from gridfs import GridFS
-import os
-from dotenv import load_dotenv
+from gridfs import GridFS, GridFSBucket
+from bson.son import SON
+from pymongo.errors import BulkWriteError
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import asyncio
+import atexit
+import time
+from config import settings
+from metrics import (
+    audit_dropped_total, workflow_updates_dropped_total, db_write_semaphore_available, track_db_operation
+)
 
-load_dotenv()
-
-MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-DATABASE_NAME = os.getenv("DATABASE_NAME", "pod_1")
+MONGODB_URL = settings.mongodb_url
+DATABASE_NAME = settings.database_name
 
 # System Limits
-FREE_PLAN_RESUME_LIMIT = 100
-MAX_FILE_SIZE_MB = 5
-
-# Connection options for MongoDB Atlas
-# For mongodb+srv:// connections, TLS is automatically enabled by pymongo
-# We just need to ensure proper timeout settings and use system CA certificates
-connection_options = {}
-if "mongodb+srv://" in MONGODB_URL:
-    # For Atlas SRV connections, ensure proper timeout and SSL settings
-    connection_options = {
-        "serverSelectionTimeoutMS": 30000,
-        "connectTimeoutMS": 20000,
-        "socketTimeoutMS": 20000,
-        "retryWrites": True,
-    }
-elif "mongodb://" in MONGODB_URL and "mongodb.net" in MONGODB_URL:
-    # For standard Atlas connections (non-SRV), explicitly enable TLS
-    connection_options = {
-        "tls": True,
-        "tlsAllowInvalidCertificates": False,
-        "serverSelectionTimeoutMS": 30000,
-        "connectTimeoutMS": 20000,
-        "socketTimeoutMS": 20000,
-        "retryWrites": True,
-    }
-
-# Synchronous client
-client = MongoClient(MONGODB_URL, **connection_options)
-db = client[DATABASE_NAME]
-fs = GridFS(db)
-
-# Async client
-async_client = AsyncIOMotorClient(MONGODB_URL, **connection_options)
+FREE_PLAN_RESUME_LIMIT = settings.free_plan_resume_limit
+MAX_FILE_SIZE_MB = settings.max_file_size_mb
+
+# MongoDB splits bulk writes into batches of at most 1000 ops server-side
+BULK_WRITE_BATCH_SIZE = 1000
+
+# GridFS chunk size for new uploads (1 MiB instead of the 255 KB default,
+# so a resume is stored in a handful of chunks / round trips)
+GRIDFS_CHUNK_SIZE_BYTES = 1024 * 1024
+
+def _pick_conn_opts(url: str) -> dict:
+    """
+    Connection options for MongoDB Atlas
+    For mongodb+srv:// connections, TLS is automatically enabled by pymongo
+    We just need to ensure proper timeout settings and use system CA certificates
+    """
+    if url.startswith("mongodb+srv://"):
+        # For Atlas SRV connections, ensure proper timeout and SSL settings
+        return {
+            "serverSelectionTimeoutMS": 30000,
+            "connectTimeoutMS": 20000,
+            "socketTimeoutMS": 20000,
+            "retryWrites": True,
+        }
+    if "mongodb.net" in url:
+        # For standard Atlas connections (non-SRV), explicitly enable TLS
+        return {
+            "tls": True,
+            "tlsAllowInvalidCertificates": False,
+            "serverSelectionTimeoutMS": 30000,
+            "connectTimeoutMS": 20000,
+            "socketTimeoutMS": 20000,
+            "retryWrites": True,
+        }
+    return {}
+
+connection_options = _pick_conn_opts(MONGODB_URL)
+
+# Connection pool sizing
+# The routers are sync endpoints on Starlette's 40-thread pool and all go
+# through the sync client, so that is the pool that needs headroom.
+# Warm sockets are kept around so hot requests skip the TCP+TLS handshake.
+connection_options.update({
+    "maxPoolSize": 200,
+    "minPoolSize": 10,
+    "maxIdleTimeMS": 300000,
+    "waitQueueTimeoutMS": 10000,
+})
+
+# Wire protocol compression - resume text and GridFS chunks compress well.
+# The server picks the first compressor in the list that it also supports.
+connection_options.update({
+    "compressors": "zstd,snappy,zlib",
+    "zlibCompressionLevel": 6,
+})
+
+# The async client only serves startup, /health and background writes;
+# don't keep idle sockets warm for it
+async_connection_options = {**connection_options, "minPoolSize": 0}
+
+# Synchronous client (lazy - only built on first use, skips a second
+# SRV lookup + TLS handshake at import time)
+@lru_cache(maxsize=1)
+def get_sync_client() -> MongoClient:
+    return MongoClient(MONGODB_URL, **connection_options)
+
+@lru_cache(maxsize=1)
+def get_sync_db():
+    return get_sync_client()[DATABASE_NAME]
+
+@lru_cache(maxsize=1)
+def get_fs() -> GridFS:
+    return GridFS(get_sync_db())
+
+@lru_cache(maxsize=1)
+def get_bucket() -> GridFSBucket:
+    return GridFSBucket(get_sync_db(), chunk_size_bytes=GRIDFS_CHUNK_SIZE_BYTES)
+
+# Read-only clients route reads to secondaries when the replica set has them,
+# offloading the primary. Use only where slightly stale data is acceptable
+# (listings, dashboards) - never for read-after-write flows. Each client has
+# its own pool, on top of the read-write pools, so they don't keep idle sockets.
+read_only_options = {
+    **connection_options,
+    "minPoolSize": 0,
+    "readPreference": "secondaryPreferred",
+    "localThresholdMS": 30,
+}
+
+@lru_cache(maxsize=1)
+def get_sync_client_ro() -> MongoClient:
+    return MongoClient(MONGODB_URL, **read_only_options)
+
+@lru_cache(maxsize=1)
+def get_async_client_ro() -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(MONGODB_URL, **read_only_options)
+
+# Async client (eager - ASGI workers need it immediately)
+async_client = AsyncIOMotorClient(MONGODB_URL, **async_connection_options)
 async_db = async_client[DATABASE_NAME]
 
 # Collection names — THESE WERE MISSING BEFORE!
@@ -55,9 +128,297 @@ AUDIT_LOG_COLLECTION = "audit_logs"
 FILE_METADATA_COLLECTION = "files"
 WORKFLOW_EXECUTION_COLLECTION = "workflow_executions"
 
+# Index key specs backing the queries in crud.py, built once as SON documents.
+# An entry is either a key spec or a (key spec, index options) pair.
+_INDEX_KEYS = {
+    RESUME_COLLECTION: (
+        SON([("uploadedAt", DESCENDING)]),
+        SON([("source", ASCENDING), ("uploadedAt", DESCENDING)]),
+        SON([("text", TEXT)]),  # $text search in search_resumes
+    ),
+    JOB_DESCRIPTION_COLLECTION: (
+        SON([("createdAt", DESCENDING)]),
+        SON([("status", ASCENDING), ("createdAt", DESCENDING)]),
+        SON([("designation", TEXT), ("description", TEXT)]),  # $text search in search_jds
+    ),
+    RESUME_RESULT_COLLECTION: (
+        SON([("jd_id", ASCENDING), ("match_score", DESCENDING)]),
+        SON([("jd_id", ASCENDING), ("fit_category", ASCENDING), ("match_score", DESCENDING)]),
+        SON([("resume_id", ASCENDING), ("jd_id", ASCENDING)]),
+    ),
+    USER_COLLECTION: (
+        (SON([("email", ASCENDING)]), {"unique": True}),
+    ),
+    AUDIT_LOG_COLLECTION: (
+        SON([("timestamp", DESCENDING)]),
+        SON([("userId", ASCENDING), ("timestamp", DESCENDING)]),
+        SON([("action", ASCENDING), ("timestamp", DESCENDING)]),
+    ),
+    FILE_METADATA_COLLECTION: (
+        SON([("resumeId", ASCENDING)]),
+    ),
+    WORKFLOW_EXECUTION_COLLECTION: (
+        SON([("workflow_id", ASCENDING)]),
+        SON([("started_at", DESCENDING)]),
+        SON([("started_by", ASCENDING), ("started_at", DESCENDING)]),
+        SON([("status", ASCENDING), ("started_at", DESCENDING)]),
+    ),
+}
+
+# Grouped per collection so each collection is created with a single
+# create_indexes round trip; the IndexModels are built once at import
+def _index_model(spec) -> IndexModel:
+    keys, options = spec if isinstance(spec, tuple) else (spec, {})
+    return IndexModel(keys, **options)
+
+INDEX_SPEC = {
+    collection: [_index_model(spec) for spec in specs]
+    for collection, specs in _INDEX_KEYS.items()
+}
+
+class _BatchingQueue(ABC):
+    """
+    Bounded asyncio.Queue drained by worker tasks that collect items into
+    batches, flushing once `batch` items are collected or `flush_ms` has passed.
+    `on_drop(n)` is called with the number of items lost (queue full, failed
+    flush, or not drained on shutdown).
+
+    Must be fed from the event loop (asyncio.Queue is not thread-safe).
+    """
+
+    def __init__(self, coll, maxsize: int, batch: int, flush_ms: int, on_drop=None):
+        self.q = asyncio.Queue(maxsize)
+        self.coll = coll
+        self.batch = batch
+        self.flush_ms = flush_ms
+        self.on_drop = on_drop
+        self._workers = []
+
+    @abstractmethod
+    async def _flush(self, batch: list):
+        """Write one batch to the collection"""
+
+    def _dropped(self, count: int):
+        if count and self.on_drop:
+            try:
+                self.on_drop(count)
+            except Exception as e:
+                print(f"Could not record {count} dropped writes for {self.coll.name}: {e}")
+
+    def _failed_count(self, batch: list, error: BulkWriteError) -> int:
+        # Unordered writes only lose the ops that errored. A BulkWriteError
+        # carrying only writeConcernErrors has no writeErrors: nothing was lost.
+        return len(error.details.get("writeErrors", []))
+
+    def _flush_failed(self, batch: list, error: Exception):
+        """Count what a failed flush lost; never lets an error escape the worker"""
+        try:
+            if isinstance(error, BulkWriteError):
+                count = self._failed_count(batch, error)
+            else:
+                count = len(batch)
+        except Exception as e:
+            print(f"Could not count failed writes for {self.coll.name}: {e}")
+            count = len(batch)
+        self._dropped(count)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.q.get()]
+            deadline = loop.time() + self.flush_ms / 1000
+            while len(batch) < self.batch and (timeout := deadline - loop.time()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self.q.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                print(f"Background write to {self.coll.name} failed: {e}")
+                self._flush_failed(batch, e)
+            finally:
+                for _ in batch:
+                    self.q.task_done()
+
+    def start(self, workers: int = 1):
+        """Spawn the drain workers (call once the event loop is running)"""
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    async def stop(self, timeout: float = 5.0):
+        """Flush pending items, then cancel the workers"""
+        try:
+            await asyncio.wait_for(self.q.join(), timeout)
+        except TimeoutError:
+            print(f"Write queue for {self.coll.name} not drained, {self.q.qsize()} items lost")
+            self._dropped(self.q.qsize())
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+class AsyncWriteQueue(_BatchingQueue):
+    """Fire-and-forget inserts, coalesced into insert_many batches"""
+
+    def __init__(self, coll, maxsize: int = 10_000, batch: int = 500,
+                 flush_ms: int = 50, on_drop=None):
+        super().__init__(coll, maxsize, batch, flush_ms, on_drop)
+
+    def submit(self, doc: dict) -> bool:
+        """Queue a document for insertion; returns False if it was dropped"""
+        try:
+            self.q.put_nowait(doc)
+            return True
+        except asyncio.QueueFull:
+            self._dropped(1)
+            return False
+
+    async def _flush(self, batch: list):
+        await self.coll.insert_many(batch, ordered=False)
+
+class UpdateBatcher(_BatchingQueue):
+    """
+    Counter/state updates (UpdateOne ops), coalesced into one bulk_write per
+    flush instead of an update_one round trip each.
+
+    With ordered=False the server may apply a batch in any order, which is fine
+    for commutative updates like $inc. Use ordered=True with a single worker
+    when updates to the same document must land in sequence.
+    """
+
+    def __init__(self, coll, flush_every: int = 100, flush_ms: int = 200,
+                 maxsize: int = 10_000, ordered: bool = False, on_drop=None):
+        super().__init__(coll, maxsize, flush_every, flush_ms, on_drop)
+        self.ordered = ordered
+
+    async def enqueue(self, op: UpdateOne):
+        """Queue an update, waiting for room if the queue is full"""
+        await self.q.put(op)
+
+    async def _flush(self, batch: list):
+        await self.coll.bulk_write(batch, ordered=self.ordered)
+
+    def _failed_count(self, batch: list, error: BulkWriteError) -> int:
+        if not self.ordered:
+            return super()._failed_count(batch, error)
+        # Ordered writes stop at the first error; everything from it on is lost
+        write_errors = error.details.get("writeErrors")
+        if not write_errors:
+            return 0
+        return len(batch) - write_errors[0]["index"]
+
+audit_queue = AsyncWriteQueue(async_db[AUDIT_LOG_COLLECTION], on_drop=audit_dropped_total.inc)
+workflow_batcher = UpdateBatcher(
+    async_db[WORKFLOW_EXECUTION_COLLECTION], ordered=True, on_drop=workflow_updates_dropped_total.inc
+)
+
+# Caps how many independent writes are in flight at once, so fanned-out
+# writes overlap their round trips without swamping the server
+_SEM = asyncio.Semaphore(settings.mongo_write_concurrency)
+db_write_semaphore_available.set(settings.mongo_write_concurrency)
+
+async def write_with_limit(write, *args, **kwargs):
+    """
+    Call write(*args, **kwargs) once a concurrency slot is free. The call itself
+    happens inside the slot: Motor submits the operation when it is called,
+    not when it is awaited, so passing an already-created future would bypass the limit.
+    """
+    async with _SEM:
+        db_write_semaphore_available.dec()
+        try:
+            return await write(*args, **kwargs)
+        finally:
+            db_write_semaphore_available.inc()
+
+async def write_resume_results(docs: list) -> list:
+    """Replace (or insert) match results keyed on (resume_id, jd_id) concurrently"""
+    coll = async_db[RESUME_RESULT_COLLECTION]
+    return await asyncio.gather(*(
+        write_with_limit(
+            coll.replace_one,
+            {"resume_id": doc["resume_id"], "jd_id": doc["jd_id"]},
+            # _id is immutable; replacing an existing result with another _id fails
+            {k: v for k, v in doc.items() if k != "_id"},
+            upsert=True
+        )
+        for doc in docs
+    ))
+
+def _offset_write_errors(error: BulkWriteError, offset: int) -> list:
+    """Write errors from one batch, with indexes relative to the full input"""
+    return [{**err, "index": err["index"] + offset} for err in error.details.get("writeErrors", [])]
+
+async def bulk_insert_resumes(docs: list, batch: int = BULK_WRITE_BATCH_SIZE) -> int:
+    """
+    Insert resumes with one unordered insert_many per batch instead of an
+    insert_one per document. Returns the number of inserted documents.
+
+    A failing batch does not stop later batches; once all were sent, a single
+    BulkWriteError is raised whose details carry every write error (indexed
+    into `docs`) and the total "nInserted".
+    """
+    start = time.perf_counter()
+    inserted = 0
+    write_errors = []
+    try:
+        for i in range(0, len(docs), batch):
+            try:
+                result = await async_db[RESUME_COLLECTION].insert_many(docs[i:i + batch], ordered=False)
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                inserted += e.details.get("nInserted", 0)
+                write_errors.extend(_offset_write_errors(e, i))
+    finally:
+        track_db_operation('resume', 'bulk_insert', time.perf_counter() - start)
+    if write_errors:
+        raise BulkWriteError({"writeErrors": write_errors, "nInserted": inserted})
+    return inserted
+
+async def bulk_upsert_resume_results(results: list, batch: int = BULK_WRITE_BATCH_SIZE) -> int:
+    """
+    Upsert match results keyed on (resume_id, jd_id) with unordered bulk_write
+    batches. Returns the number of upserted plus modified documents.
+
+    Failures are collected across batches and raised as one BulkWriteError
+    once all batches were sent (see bulk_insert_resumes).
+    """
+    start = time.perf_counter()
+    upserted = modified = 0
+    write_errors = []
+    try:
+        for i in range(0, len(results), batch):
+            ops = [
+                UpdateOne(
+                    {"resume_id": doc["resume_id"], "jd_id": doc["jd_id"]},
+                    # _id is immutable; $set-ing it on an existing result fails
+                    {"$set": {k: v for k, v in doc.items() if k != "_id"}},
+                    upsert=True
+                )
+                for doc in results[i:i + batch]
+            ]
+            try:
+                result = await async_db[RESUME_RESULT_COLLECTION].bulk_write(ops, ordered=False)
+                upserted += result.upserted_count
+                modified += result.modified_count
+            except BulkWriteError as e:
+                upserted += e.details.get("nUpserted", 0)
+                modified += e.details.get("nModified", 0)
+                write_errors.extend(_offset_write_errors(e, i))
+    finally:
+        track_db_operation('resume_result', 'bulk_upsert', time.perf_counter() - start)
+    if write_errors:
+        raise BulkWriteError({"writeErrors": write_errors, "nUpserted": upserted, "nModified": modified})
+    return upserted + modified
+
 def get_db():
     try:
-        yield db
+        yield get_sync_db()
+    finally:
+        pass
+
+def get_db_ro():
+    try:
+        yield get_sync_client_ro()[DATABASE_NAME]
     finally:
         pass
 
@@ -67,17 +428,94 @@ def get_async_db():
     finally:
         pass
 
+def get_async_db_ro():
+    try:
+        yield get_async_client_ro()[DATABASE_NAME]
+    finally:
+        pass
+
+async def init_db_async():
+    """Create all indexes, one create_indexes call per collection, run concurrently"""
+    print("Initializing database and creating indexes...")
+    results = await asyncio.gather(*(
+        async_db[collection].create_indexes(models)
+        for collection, models in INDEX_SPEC.items()
+    ), return_exceptions=True)
+    for collection, result in zip(INDEX_SPEC, results):
+        if isinstance(result, Exception):
+            print(f"Index creation failed for {collection}: {result}")
+    print("Database initialization complete!")
+
 def init_db():
+    # Sync variant for CLI/scripts. Uses the sync client rather than
+    # asyncio.run() so the async client is never bound to a throwaway loop.
     print("Initializing database and creating indexes...")
-    # (your full init_db function here - it's already in your old file, so we keep it)
-    # ... keeping all your indexes ...
+    sync_db = get_sync_db()
+    for collection, models in INDEX_SPEC.items():
+        try:
+            sync_db[collection].create_indexes(models)
+        except Exception as e:
+            print(f"Index creation failed for {collection}: {e}")
     print("Database initialization complete!")
 
+# Health probes can hit this every second; the last ping result is trusted for
+# a while instead of issuing another round trip. Failures are cached briefly
+# too, so probes don't pile up pings while the DB is unreachable.
+_PING_TTL_SECONDS = 5.0
+_PING_FAILURE_TTL_SECONDS = 2.0
+# Well under the 10s probe timeout (Dockerfile HEALTHCHECK)
+_PING_TIMEOUT_SECONDS = 5.0
+_last_ping = None  # (monotonic time, ok) of the last real ping
+
+def _cached_ping():
+    """The last ping result if it is still fresh, else None"""
+    if _last_ping is None:
+        return None
+    checked_at, ok = _last_ping
+    ttl = _PING_TTL_SECONDS if ok else _PING_FAILURE_TTL_SECONDS
+    return ok if time.monotonic() - checked_at < ttl else None
+
+def _record_ping(ok: bool, error: Exception = None) -> bool:
+    """Store a ping result, logging only when reachability changes"""
+    global _last_ping
+    changed = _last_ping is None or _last_ping[1] != ok
+    _last_ping = (time.monotonic(), ok)
+    if changed:
+        if ok:
+            print("MongoDB connection successful!")
+        else:
+            print(f"MongoDB connection failed: {error}")
+    return ok
+
+async def test_connection_async():
+    cached = _cached_ping()
+    if cached is not None:
+        return cached
+    try:
+        await asyncio.wait_for(async_client.admin.command('ping'), _PING_TIMEOUT_SECONDS)
+        return _record_ping(True)
+    except Exception as e:
+        return _record_ping(False, e)
+
 def test_connection():
+    # Sync variant for CLI/scripts; uses the sync client so the async client
+    # is never driven from a foreign event loop
+    cached = _cached_ping()
+    if cached is not None:
+        return cached
     try:
-        client.admin.command('ping')
-        print("MongoDB connection successful!")
-        return True
+        get_sync_client().admin.command('ping')
+        return _record_ping(True)
     except Exception as e:
-        print(f"MongoDB connection failed: {e}")
-        return False
+        return _record_ping(False, e)
+
+@atexit.register
+def _close_clients():
+    # Only close the sync client if it was actually instantiated
+    if get_sync_client.cache_info().currsize:
+        get_sync_client().close()
+    if get_sync_client_ro.cache_info().currsize:
+        get_sync_client_ro().close()
+    if get_async_client_ro.cache_info().currsize:
+        get_async_client_ro().close()
+    async_client.close()
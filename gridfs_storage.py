@@ -10,10 +10,11 @@ Why GridFS?
 - Simple to use and deploy
 """
 
-from database import fs, db
+from database import get_fs, get_bucket
 from bson import ObjectId
 from typing import Optional, BinaryIO
 import hashlib
+import io
 
 def upload_file(file_content: bytes, filename: str, content_type: str, 
                 metadata: dict = None) -> str:
@@ -29,11 +30,12 @@ def upload_file(file_content: bytes, filename: str, content_type: str,
     Returns:
         GridFS file ID as string
     """
-    file_id = fs.put(
-        file_content,
-        filename=filename,
-        content_type=content_type,
-        metadata=metadata or {}
+    # The bucket API has no top-level contentType field, keep it in metadata
+    metadata = {**(metadata or {}), "contentType": content_type}
+    file_id = get_bucket().upload_from_stream(
+        filename,
+        io.BytesIO(file_content),
+        metadata=metadata
     )
     return str(file_id)
 
@@ -46,6 +48,7 @@ def download_file(file_id: str) -> tuple[bytes, str, str]:
     
     Returns:
         Tuple of (file_content, filename, content_type)
+        file_content is a bytearray pre-sized from the stored file length
     """
     try:
         print(f"🔍 GridFS: Converting file_id to ObjectId: {file_id}")
@@ -53,16 +56,26 @@ def download_file(file_id: str) -> tuple[bytes, str, str]:
         print(f"✅ ObjectId created: {obj_id}")
         
         print(f"🔍 GridFS: Fetching file from GridFS...")
-        grid_out = fs.get(obj_id)
+        grid_out = get_bucket().open_download_stream(obj_id)
         print(f"✅ GridFS file found: {grid_out.filename}")
         
-        content = grid_out.read()
+        # Read chunks straight into a pre-allocated buffer
+        content = bytearray(grid_out.length)
+        view = memoryview(content)
+        pos = 0
+        while pos < grid_out.length:
+            chunk = grid_out.readchunk()
+            if not chunk:
+                break
+            view[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
         print(f"✅ File content read: {len(content)} bytes")
         
+        content_type = grid_out.content_type or (grid_out.metadata or {}).get("contentType")
         return (
             content,
             grid_out.filename,
-            grid_out.content_type or 'application/octet-stream'
+            content_type or 'application/octet-stream'
         )
     except Exception as e:
         print(f"❌ GridFS download failed: {type(e).__name__}: {e}")
@@ -81,7 +94,7 @@ def delete_file(file_id: str) -> bool:
         True if deleted successfully
     """
     try:
-        fs.delete(ObjectId(file_id))
+        get_bucket().delete(ObjectId(file_id))
         return True
     except Exception:
         return False
@@ -89,7 +102,7 @@ def delete_file(file_id: str) -> bool:
 def file_exists(file_id: str) -> bool:
     """Check if file exists in GridFS"""
     try:
-        fs.get(ObjectId(file_id))
+        get_fs().get(ObjectId(file_id))
         return True
     except Exception:
         return False
@@ -101,7 +114,7 @@ def calculate_checksum(file_content: bytes) -> str:
 def get_storage_stats() -> dict:
     """Get GridFS storage statistics"""
     # Get all files
-    files = list(fs.find())
+    files = list(get_fs().find())
     total_size = sum(f.length for f in files)
     file_count = len(files)
     
@@ -113,12 +126,12 @@ def get_storage_stats() -> dict:
 
 def list_user_files(user_id: str) -> list:
     """List all files uploaded by a user"""
-    files = fs.find({"metadata.uploaded_by": user_id})
+    files = get_fs().find({"metadata.uploaded_by": user_id})
     return [
         {
             "file_id": str(f._id),
             "filename": f.filename,
-            "content_type": f.content_type,
+            "content_type": f.content_type or (f.metadata or {}).get("contentType"),
             "size": f.length,
             "upload_date": f.upload_date,
             "metadata": f.metadata
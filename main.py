@@ -3,10 +3,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
-from dotenv import load_dotenv
 
 # Import database initialization
-from database import init_db, test_connection
+from database import init_db_async, test_connection_async, audit_queue, workflow_batcher
 
 # Import routers
 from routers import auth, resumes, job_descriptions, matching, files, analytics, audit, workflow
@@ -14,8 +13,6 @@ from routers import auth, resumes, job_descriptions, matching, files, analytics,
 # Note: Using MongoDB GridFS for file storage (no Azure needed!)
 # Free plan: 10 resumes max, 5MB per file = 50MB total storage
 
-load_dotenv()
-
 
 def get_cors_settings():
     """Return (origins, allow_credentials) derived from env configuration."""
@@ -31,15 +28,19 @@ def get_cors_settings():
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting HR Resume Comparator API...")
-    if test_connection():
-        init_db()
+    if await test_connection_async():
+        await init_db_async()
     else:
         print("⚠️ Database connection failed! Please check your MongoDB connection.")
+    audit_queue.start(workers=4)
+    workflow_batcher.start()
     
     yield
     
     # Shutdown
     print("👋 Shutting down HR Resume Comparator API...")
+    await workflow_batcher.stop()
+    await audit_queue.stop()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -100,21 +101,18 @@ def root():
     }
 
 @app.get("/health")
-def health_check():
-    """Health check endpoint"""
-    try:
-        test_connection()
+async def health_check():
+    """Health check endpoint (DB ping is cached for a few seconds)"""
+    if await test_connection_async():
         return {
             "status": "healthy",
             "database": "connected",
             "service": "HR Resume Comparator API"
         }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e)
-        }
+    return {
+        "status": "unhealthy",
+        "database": "disconnected"
+    }
 
 @app.get("/api/info")
 def api_info():
@@ -4,20 +4,76 @@ Custom business metrics for monitoring the HR Resume Comparator application.
 These metrics provide insights into business operations beyond standard HTTP metrics.
 """
 
-from prometheus_client import Counter, Histogram, Gauge, Info
+from collections import deque
+from types import MappingProxyType
+from typing import Literal, get_args
+import os
+import threading
+import time
+from prometheus_client import Counter, Histogram, Gauge, disable_created_metrics
+
+# Drop the *_created sample exported next to every counter/histogram child.
+# Nothing queries it, and it adds a series per label combination to every scrape.
+disable_created_metrics()
+
+# ============================================
+# Allowed Label Values
+# ============================================
+# Every label has a small, fixed value set. Free-form strings or raw numbers
+# as label values create one time series per distinct value, forever.
+WorkflowStatus = Literal['success', 'failed', 'partial']
+FileType = Literal['pdf', 'docx', 'txt']
+MatchingSource = Literal['manual', 'auto']
+AIEndpoint = Literal['compare-batch', 'extract-resume', 'extract-jd']
+FitCategory = Literal['Best Fit', 'Partial Fit', 'Not Fit']
+WorkflowType = Literal['manual', 'scheduled']
+StorageType = Literal['resumes', 'other']
+FileOperation = Literal['upload', 'download', 'delete']
+DBCollection = Literal['resume', 'jd', 'resume_result', 'users', 'audit_logs', 'files', 'workflow_executions']
+DBOperation = Literal['find', 'insert', 'update', 'delete', 'bulk_insert', 'bulk_upsert']
+
+# Frozen at import; the tables below are built from these once
+_STATUS_LABEL = MappingProxyType({True: 'success', False: 'failed'})
+_OUTCOMES = tuple(_STATUS_LABEL)
+FILE_TYPES = get_args(FileType)
+MATCHING_SOURCES = get_args(MatchingSource)
+AI_ENDPOINTS = get_args(AIEndpoint)
+WORKFLOW_TYPES = get_args(WorkflowType)
+WORKFLOW_STATUSES = get_args(WorkflowStatus)
+STORAGE_TYPES = get_args(StorageType)
+FILE_OPERATIONS = get_args(FileOperation)
+DB_COLLECTIONS = get_args(DBCollection)
+# Only pairs that can actually occur are pre-bound (and exported): the basic
+# CRUD operations on every collection, bulk operations where a helper exists
+DB_OPERATION_PAIRS = tuple(
+    (c, op) for c in DB_COLLECTIONS for op in ('find', 'insert', 'update', 'delete')
+) + (
+    ('resume', 'bulk_insert'),
+    ('resume_result', 'bulk_upsert'),
+)
+
+def _child(table: dict, key, label: str):
+    """Look up a pre-bound child method, rejecting label values outside the enumerated set"""
+    try:
+        return table[key]
+    except KeyError:
+        raise ValueError(f"Invalid {label} label value(s): {key!r}") from None
 
 # ============================================
 # Application Info
 # ============================================
-app_info = Info(
-    'hr_backend_app',
-    'HR Backend API application information'
+# Set exactly once at import: only one label combination may ever exist per
+# process, so a rolling deploy swaps one series instead of stacking them up.
+build_info = Gauge(
+    'hr_backend_build_info',
+    'HR Backend API build information (always 1)',
+    ['version', 'service', 'environment']
 )
-app_info.info({
-    'version': '1.0.0',
-    'service': 'backend-api',
-    'environment': 'production'
-})
+build_info.labels(
+    version=os.getenv('APP_VERSION', '1.0.0'),
+    service='backend-api',
+    environment=os.getenv('ENVIRONMENT', 'dev')
+).set(1)
 
 # ============================================
 # Resume Metrics
@@ -27,13 +83,22 @@ resume_uploads_total = Counter(
     'Total number of resumes uploaded',
     ['status', 'file_type']  # status: success/failed, file_type: pdf/docx
 )
+# Label tables map (success, enum...) straight to the bound child method
+_RESUME_UPLOAD = {
+    (ok, ft): resume_uploads_total.labels(status=_STATUS_LABEL[ok], file_type=ft).inc
+    for ok in _OUTCOMES for ft in FILE_TYPES
+}
 
 resume_parse_duration = Histogram(
     'hr_resume_parse_duration_seconds',
     'Time spent parsing resume files',
     ['file_type'],
-    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+    # 0.5s: interactive upload, 2s: acceptable, 10s: slow (large/scanned file)
+    buckets=[0.5, 2.0, 10.0]
 )
+_RESUME_PARSE = {
+    ft: resume_parse_duration.labels(file_type=ft).observe for ft in FILE_TYPES
+}
 
 resumes_total = Gauge(
     'hr_resumes_total',
@@ -48,6 +113,7 @@ jd_created_total = Counter(
     'Total number of job descriptions created',
     ['status']  # status: success/failed
 )
+_JD_CREATED = {ok: jd_created_total.labels(status=_STATUS_LABEL[ok]).inc for ok in _OUTCOMES}
 
 jd_total = Gauge(
     'hr_job_descriptions_total',
@@ -62,12 +128,16 @@ matching_requests_total = Counter(
     'Total number of resume-JD matching requests',
     ['status', 'source']  # status: success/failed, source: manual/auto
 )
+_MATCHING_REQUEST = {
+    (ok, src): matching_requests_total.labels(status=_STATUS_LABEL[ok], source=src).inc
+    for ok in _OUTCOMES for src in MATCHING_SOURCES
+}
 
 matching_duration = Histogram(
     'hr_matching_duration_seconds',
     'Time spent on AI matching operations',
-    ['batch_size'],
-    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0]
+    # 10s: single resume, 60s: small batch, 300s: large batch, 1800s: near the AI Agent timeout
+    buckets=[10.0, 60.0, 300.0, 1800.0]
 )
 
 ai_agent_calls_total = Counter(
@@ -75,13 +145,19 @@ ai_agent_calls_total = Counter(
     'Total calls to AI Agent service',
     ['endpoint', 'status']  # endpoint: compare-batch/extract-resume/extract-jd
 )
+_AI_AGENT_CALL = {
+    (ep, ok): ai_agent_calls_total.labels(endpoint=ep, status=_STATUS_LABEL[ok]).inc
+    for ep in AI_ENDPOINTS for ok in _OUTCOMES
+}
 
 ai_agent_latency = Histogram(
     'hr_ai_agent_latency_seconds',
     'Latency of AI Agent API calls',
     ['endpoint'],
-    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+    # 5s: extraction SLO, 30s: comparison SLO, 120s: degraded
+    buckets=[5.0, 30.0, 120.0]
 )
+_AI_AGENT_LATENCY = {ep: ai_agent_latency.labels(endpoint=ep).observe for ep in AI_ENDPOINTS}
 
 # ============================================
 # Match Results Metrics
@@ -89,8 +165,10 @@ ai_agent_latency = Histogram(
 match_scores = Histogram(
     'hr_match_scores',
     'Distribution of resume match scores',
-    buckets=[10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+    # Roughly Not Fit (<30) / weak (<60) / Partial-Best Fit (<90) / exceptional
+    buckets=[30, 60, 90]
 )
+_MATCH_SCORE = match_scores.observe
 
 candidates_by_fit = Gauge(
     'hr_candidates_by_fit_category',
@@ -98,6 +176,10 @@ candidates_by_fit = Gauge(
     ['category']  # Best Fit, Partial Fit, Not Fit
 )
 
+_BEST_FIT = candidates_by_fit.labels(category='Best Fit').set
+_PARTIAL_FIT = candidates_by_fit.labels(category='Partial Fit').set
+_NOT_FIT = candidates_by_fit.labels(category='Not Fit').set
+
 # ============================================
 # User/Auth Metrics
 # ============================================
@@ -106,6 +188,7 @@ user_logins_total = Counter(
     'Total user login attempts',
     ['status']  # success/failed
 )
+_USER_LOGIN = {ok: user_logins_total.labels(status=_STATUS_LABEL[ok]).inc for ok in _OUTCOMES}
 
 active_users = Gauge(
     'hr_active_users',
@@ -117,6 +200,9 @@ user_registrations_total = Counter(
     'Total user registrations',
     ['status']
 )
+_USER_REGISTRATION = {
+    ok: user_registrations_total.labels(status=_STATUS_LABEL[ok]).inc for ok in _OUTCOMES
+}
 
 # ============================================
 # Workflow Metrics
@@ -126,24 +212,30 @@ workflows_started_total = Counter(
     'Total workflows started',
     ['type']  # manual/scheduled
 )
+_WORKFLOW_STARTED = {t: workflows_started_total.labels(type=t).inc for t in WORKFLOW_TYPES}
 
 workflows_completed_total = Counter(
     'hr_workflows_completed_total',
     'Total workflows completed',
     ['status']  # success/failed/partial
 )
+_WORKFLOW_COMPLETED = {
+    s: workflows_completed_total.labels(status=s).inc for s in WORKFLOW_STATUSES
+}
 
 workflow_duration = Histogram(
     'hr_workflow_duration_seconds',
     'Total workflow execution time',
-    ['resume_count'],
-    buckets=[30, 60, 120, 300, 600, 900, 1800]
+    # 60s: small run, 300s: typical run, 1800s: large run (anything above needs a look)
+    buckets=[60, 300, 1800]
 )
 
 workflow_in_progress = Gauge(
     'hr_workflows_in_progress',
     'Number of workflows currently in progress'
 )
+_WORKFLOW_IN_PROGRESS_INC = workflow_in_progress.inc
+_WORKFLOW_IN_PROGRESS_DEC = workflow_in_progress.dec
 
 # ============================================
 # File Storage Metrics
@@ -153,12 +245,17 @@ file_storage_bytes = Gauge(
     'Total file storage used in GridFS',
     ['type']  # resumes/other
 )
+_FILE_STORAGE = {t: file_storage_bytes.labels(type=t).set for t in STORAGE_TYPES}
 
 file_operations_total = Counter(
     'hr_file_operations_total',
     'Total file operations',
     ['operation', 'status']  # operation: upload/download/delete
 )
+_FILE_OPERATION = {
+    (op, ok): file_operations_total.labels(operation=op, status=_STATUS_LABEL[ok]).inc
+    for op in FILE_OPERATIONS for ok in _OUTCOMES
+}
 
 # ============================================
 # Database Metrics
@@ -168,54 +265,165 @@ db_operations_total = Counter(
     'Total database operations',
     ['collection', 'operation']  # collection: resume/jd/users, operation: find/insert/update/delete
 )
+_DB_OPERATION = {
+    (c, op): db_operations_total.labels(collection=c, operation=op).inc
+    for c, op in DB_OPERATION_PAIRS
+}
 
 db_operation_duration = Histogram(
     'hr_db_operation_duration_seconds',
     'Database operation latency',
     ['collection', 'operation'],
-    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+    # 5ms: indexed lookup, 50ms: normal query, 500ms: slow query
+    buckets=[0.005, 0.05, 0.5]
+)
+_DB_OPERATION_DURATION = {
+    (c, op): db_operation_duration.labels(collection=c, operation=op).observe
+    for c, op in DB_OPERATION_PAIRS
+}
+
+db_write_semaphore_available = Gauge(
+    'hr_db_write_semaphore_available',
+    'Free slots for concurrent background DB writes (0 = saturated)'
+)
+
+audit_dropped_total = Counter(
+    'hr_audit_dropped_total',
+    'Audit log writes lost by the background write queue (queue full, failed flush, or not drained on shutdown)'
+)
+
+workflow_updates_dropped_total = Counter(
+    'hr_workflow_updates_dropped_total',
+    'Workflow state updates lost by the background batcher (failed flush or not drained on shutdown)'
 )
 
+# ============================================
+# Deferred Emission
+# ============================================
+class MetricRing:
+    """
+    Bounded buffer of pending metric updates, drained by one background thread.
+
+    prometheus_client takes a lock on every inc/observe/set; request threads
+    only append (fn, value) here, which is atomic in CPython and lock-free.
+    Values reach the real metrics within `interval` seconds, well inside the
+    scrape interval.
+    """
+
+    def __init__(self, size: int = 4096, interval: float = 0.1):
+        self.size = size
+        self.interval = interval
+        self.buf = deque()
+        self._thread = None
+
+    def push(self, fn, value) -> bool:
+        """Queue an update; returns False if the ring is full"""
+        if len(self.buf) >= self.size:
+            return False
+        self.buf.append((fn, value))
+        return True
+
+    def drain(self):
+        """Apply all pending updates to the real metrics"""
+        popleft = self.buf.popleft
+        while True:
+            try:
+                fn, value = popleft()
+            except IndexError:
+                return
+            try:
+                fn(value)
+            except Exception as e:
+                # One bad update must not kill the flusher thread
+                print(f"Dropped metric update {fn!r}({value!r}): {e}")
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.drain()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='metric-ring', daemon=True)
+            self._thread.start()
+
+_ring = MetricRing()
+_ring.start()
+
+def _emit(fn, value=1):
+    """
+    Defer a metric update to the flusher, emitting directly if the ring is full.
+    Only for order-independent updates (inc/dec/observe): a gauge .set applied
+    directly could later be overwritten by an older queued value, so setters
+    bypass the ring altogether.
+    """
+    # Coerce here so bad input fails on the calling thread, not in the flusher
+    value = float(value)
+    if not _ring.push(fn, value):
+        fn(value)
+
 # ============================================
 # Helper Functions
 # ============================================
-def track_resume_upload(success: bool, file_type: str):
+def track_resume_upload(success: bool, file_type: FileType):
     """Track resume upload metric"""
-    status = 'success' if success else 'failed'
-    resume_uploads_total.labels(status=status, file_type=file_type).inc()
+    _emit(_child(_RESUME_UPLOAD, (success, file_type), 'file_type'))
+
+def track_resume_parse(file_type: FileType, duration: float):
+    """Track resume parse duration"""
+    _emit(_child(_RESUME_PARSE, file_type, 'file_type'), duration)
 
-def track_matching_request(success: bool, source: str = 'manual'):
+def track_jd_created(success: bool):
+    """Track job description creation metric"""
+    _emit(_child(_JD_CREATED, success, 'success'))
+
+def track_matching_request(success: bool, source: MatchingSource = 'manual'):
     """Track matching request metric"""
-    status = 'success' if success else 'failed'
-    matching_requests_total.labels(status=status, source=source).inc()
+    _emit(_child(_MATCHING_REQUEST, (success, source), 'source'))
 
-def track_ai_agent_call(endpoint: str, success: bool, duration: float):
+def track_ai_agent_call(endpoint: AIEndpoint, success: bool, duration: float):
     """Track AI Agent call metric"""
-    status = 'success' if success else 'failed'
-    ai_agent_calls_total.labels(endpoint=endpoint, status=status).inc()
-    ai_agent_latency.labels(endpoint=endpoint).observe(duration)
+    _emit(_child(_AI_AGENT_CALL, (endpoint, success), 'endpoint'))
+    _emit(_AI_AGENT_LATENCY[endpoint], duration)
 
 def track_match_score(score: float):
     """Track match score distribution"""
-    match_scores.observe(score)
+    _emit(_MATCH_SCORE, score)
 
 def update_fit_categories(best_fit: int, partial_fit: int, not_fit: int):
     """Update fit category gauges"""
-    candidates_by_fit.labels(category='Best Fit').set(best_fit)
-    candidates_by_fit.labels(category='Partial Fit').set(partial_fit)
-    candidates_by_fit.labels(category='Not Fit').set(not_fit)
+    _BEST_FIT(best_fit)
+    _PARTIAL_FIT(partial_fit)
+    _NOT_FIT(not_fit)
 
 def track_user_login(success: bool):
     """Track user login metric"""
-    status = 'success' if success else 'failed'
-    user_logins_total.labels(status=status).inc()
+    _emit(_child(_USER_LOGIN, success, 'success'))
+
+def track_user_registration(success: bool):
+    """Track user registration metric"""
+    _emit(_child(_USER_REGISTRATION, success, 'success'))
 
 def track_workflow(started: bool = False, completed: bool = False, 
-                   status: str = 'success', workflow_type: str = 'manual'):
+                   status: WorkflowStatus = 'success', workflow_type: WorkflowType = 'manual'):
     """Track workflow metrics"""
     if started:
-        workflows_started_total.labels(type=workflow_type).inc()
-        workflow_in_progress.inc()
+        _emit(_child(_WORKFLOW_STARTED, workflow_type, 'type'))
+        _emit(_WORKFLOW_IN_PROGRESS_INC)
     if completed:
-        workflows_completed_total.labels(status=status).inc()
-        workflow_in_progress.dec()
+        _emit(_child(_WORKFLOW_COMPLETED, status, 'status'))
+        _emit(_WORKFLOW_IN_PROGRESS_DEC)
+
+def track_file_operation(operation: FileOperation, success: bool):
+    """Track file operation metric"""
+    _emit(_child(_FILE_OPERATION, (operation, success), 'operation'))
+
+def track_db_operation(collection: DBCollection, operation: DBOperation, duration: float):
+    """Track database operation metric"""
+    key = (collection, operation)
+    _emit(_child(_DB_OPERATION, key, 'collection/operation'))
+    _emit(_DB_OPERATION_DURATION[key], duration)
+
+def update_file_storage(storage_type: StorageType, size_bytes: int):
+    """Update file storage gauge"""
+    _child(_FILE_STORAGE, storage_type, 'type')(size_bytes)
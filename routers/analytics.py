@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 
 import schemas
 import crud
-from database import get_db, RESUME_COLLECTION, RESUME_RESULT_COLLECTION, JOB_DESCRIPTION_COLLECTION
+from database import get_db_ro, RESUME_COLLECTION, RESUME_RESULT_COLLECTION, JOB_DESCRIPTION_COLLECTION
 from routers.auth import get_current_user
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 @router.get("/stats", response_model=schemas.MatchingStatsResponse)
 def get_overall_stats(
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Get overall system statistics
@@ -35,7 +35,7 @@ def get_overall_stats(
 def get_jd_statistics(
     jd_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Get statistics for a specific job description
@@ -61,7 +61,7 @@ def get_jd_statistics(
 @router.get("/dashboard")
 def get_dashboard_data(
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Get dashboard data for frontend
@@ -113,7 +113,7 @@ def get_audit_logs(
     limit: int = 50,
     action: str = None,
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Get audit logs (Admin only)
@@ -140,7 +140,7 @@ def get_audit_logs(
 @router.get("/trends")
 def get_dashboard_trends(
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Get trend statistics for dashboard
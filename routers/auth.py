@@ -6,14 +6,11 @@ from datetime import datetime, timedelta
 import bcrypt
 from jose import JWTError, jwt
 import os
-from dotenv import load_dotenv
 
 import schemas
 import crud
 from database import get_db, USER_COLLECTION, AUDIT_LOG_COLLECTION
 
-load_dotenv()
-
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 # Security configuration
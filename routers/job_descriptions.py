@@ -5,7 +5,7 @@ from typing import List, Optional
 
 import schemas
 import crud
-from database import get_db
+from database import get_db, get_db_ro
 from routers.auth import get_current_user
 
 router = APIRouter(prefix="/job-descriptions", tags=["Job Descriptions"])
@@ -63,7 +63,7 @@ def list_job_descriptions(
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     List all job descriptions with pagination
@@ -167,7 +167,7 @@ def search_job_descriptions(
     q: str = Query(..., min_length=3, description="Search query"),
     limit: int = Query(20, ge=1, le=50),
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Full-text search in job descriptions
@@ -191,7 +191,7 @@ def search_job_descriptions(
 def get_jd_count(
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """Get total JD count, optionally filtered by status"""
     count = crud.count_jds(db, status)
@@ -5,7 +5,7 @@ from typing import List, Optional
 
 import schemas
 import crud
-from database import get_db
+from database import get_db, get_db_ro
 from routers.auth import get_current_user
 
 router = APIRouter(prefix="/resumes", tags=["Resumes"])
@@ -52,7 +52,7 @@ def list_resumes(
     limit: int = Query(100, ge=1, le=100),
     source: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     List all resumes with pagination
@@ -156,7 +156,7 @@ def search_resumes(
     q: str = Query(..., min_length=3, description="Search query"),
     limit: int = Query(20, ge=1, le=50),
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """
     Full-text search in resumes
@@ -180,7 +180,7 @@ def search_resumes(
 def get_resume_count(
     source: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_db_ro)
 ):
     """Get total resume count, optionally filtered by source"""
     count = crud.count_resumes(db, source)